@@ -1,15 +1,91 @@
 import asyncpg
 import os
+from fastapi import Request
 from dotenv import load_dotenv
+from .models import init_db
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Keep min/max per worker below max_connections / number of uvicorn workers
+PG_POOL_MIN = int(os.getenv("PG_POOL_MIN", 5))
+PG_POOL_MAX = int(os.getenv("PG_POOL_MAX", 20))
+
+# Hot queries prepared on every pooled connection as it is opened
+HOT_QUERIES = {
+    "host_by_code": "SELECT host_name FROM rooms WHERE code = $1",
+    "current_round": "SELECT current_round FROM rooms WHERE code = $1",
+    "player_word": "SELECT word, is_mafia FROM players WHERE room_code = $1 AND name = $2",
+    "player_is_mafia": "SELECT is_mafia FROM players WHERE room_code = $1 AND name = $2",
+    "vote_count": """
+        SELECT COUNT(DISTINCT voter_name)
+        FROM votes
+        WHERE room_code = $1 AND round = $2
+    """,
+    # Upserts the vote and returns both counts in one round-trip. The
+    # SELECTs share the INSERT's snapshot and cannot see the new row, so
+    # the voter is excluded from the scan and added back via ins.
+    "cast_vote": """
+        WITH ins AS (
+            INSERT INTO votes (room_code, round, voter_name, voted_name)
+            VALUES ($1, $2, $3, $4)
+            ON CONFLICT (room_code, voter_name, round) DO UPDATE
+            SET voted_name = EXCLUDED.voted_name
+            RETURNING 1
+        )
+        SELECT
+            (SELECT COUNT(*) FROM players WHERE room_code = $1) AS active_players,
+            (SELECT COUNT(DISTINCT voter_name) FROM votes
+             WHERE room_code = $1 AND round = $2 AND voter_name <> $3)
+            + (SELECT COUNT(*) FROM ins) AS current_votes
+    """,
+    "top_vote": """
+        SELECT voted_name, COUNT(*) as votes
+        FROM votes
+        WHERE room_code = $1 AND round = $2
+        GROUP BY voted_name
+        ORDER BY votes DESC
+        LIMIT 1
+    """,
+}
+
+class GameConnection(asyncpg.Connection):
+    """Connection carrying prepared statements for HOT_QUERIES"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = {}
+
+async def prepare_hot_queries(conn):
+    # Pool init= callback: every new connection pays Parse/Describe once, up front
+    for key, query in HOT_QUERIES.items():
+        conn.prepared[key] = await conn.prepare(query)
+
 db_pool = None
 
 async def get_db_pool():
     global db_pool
     if db_pool is None:
-        db_pool = await asyncpg.create_pool(DATABASE_URL)
+        # Schema must exist before the pool's init callback prepares statements
+        conn = await asyncpg.connect(DATABASE_URL)
+        try:
+            await init_db(conn)
+        finally:
+            await conn.close()
+
+        db_pool = await asyncpg.create_pool(
+            DATABASE_URL,
+            min_size=PG_POOL_MIN,
+            max_size=PG_POOL_MAX,
+            max_inactive_connection_lifetime=300,
+            statement_cache_size=512,
+            max_cached_statement_lifetime=0,
+            connection_class=GameConnection,
+            init=prepare_hot_queries,
+        )
     return db_pool
+
+def get_pool(request: Request):
+    """FastAPI dependency returning the pool created at startup"""
+    return request.app.state.pool
@@ -1,9 +1,12 @@
+import asyncio
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .models import init_db
+from fastapi.responses import ORJSONResponse
+from .db import get_db_pool
 from .routers import game
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 origins = ["http://localhost:3000", "https://find-the-spy-frontend.vercel.app/"]
 app.add_middleware(
@@ -14,8 +17,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+WORD_REFRESH_INTERVAL = 3600  # seconds, once a real word list is loaded
+WORD_RETRY_INTERVAL = 30  # seconds, while still on the fallback words
+
+async def refresh_words():
+    # Runs in the background so startup never waits on the word API
+    while True:
+        app.state.words = await game.fetch_word_list(app.state.http, app.state.words)
+        if app.state.words is game.FALLBACK_WORDS:
+            await asyncio.sleep(WORD_RETRY_INTERVAL)
+        else:
+            await asyncio.sleep(WORD_REFRESH_INTERVAL)
+
 @app.on_event("startup")
 async def startup():
-    await init_db()
+    # Creates the schema, then the pool (which prepares the hot queries)
+    app.state.pool = await get_db_pool()
+    app.state.http = httpx.AsyncClient(
+        timeout=2.0, limits=httpx.Limits(max_keepalive_connections=10)
+    )
+    app.state.words = game.FALLBACK_WORDS
+    app.state.word_refresh = asyncio.create_task(refresh_words())
+
+@app.on_event("shutdown")
+async def shutdown():
+    app.state.word_refresh.cancel()
+    await app.state.http.aclose()
+    await app.state.pool.close()
 
 app.include_router(game.router)
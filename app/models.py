@@ -1,52 +1,83 @@
-from .db import get_db_pool
+async def init_db(conn):
+    # Rooms table
+    await conn.execute("""
+    CREATE TABLE IF NOT EXISTS rooms (
+        id SERIAL PRIMARY KEY,
+        code VARCHAR(6) UNIQUE,
+        mafia_count INT,
+        status TEXT DEFAULT 'waiting',  -- waiting, ongoing, ended
+        current_round INT DEFAULT 0
+    );
+    """)
+    await conn.execute("""
+    ALTER TABLE rooms ADD COLUMN IF NOT EXISTS current_round INT DEFAULT 0;
+    ALTER TABLE rooms ADD COLUMN IF NOT EXISTS host_name TEXT;
+    ALTER TABLE rooms ADD COLUMN IF NOT EXISTS current_phase TEXT;
+    """)
 
-async def init_db():
-    pool = await get_db_pool()
-    async with pool.acquire() as conn:
-        # Rooms table
-        await conn.execute("""
-        CREATE TABLE IF NOT EXISTS rooms (
-            id SERIAL PRIMARY KEY,
-            code VARCHAR(6) UNIQUE,
-            mafia_count INT,
-            status TEXT DEFAULT 'waiting'  -- waiting, ongoing, ended
-        );
-        """)
+    # Players table
+    await conn.execute("""
+    CREATE TABLE IF NOT EXISTS players (
+        id SERIAL PRIMARY KEY,
+        room_code VARCHAR(6),
+        name TEXT,
+        is_mafia BOOLEAN,
+        eliminated BOOLEAN DEFAULT FALSE,
+        UNIQUE(room_code, name) ,
+        word TEXT,
+        score INT DEFAULT 0,
+        round INT DEFAULT 1
+    );
+    """)
 
-        # Players table
-        await conn.execute("""
-        CREATE TABLE IF NOT EXISTS players (
-            id SERIAL PRIMARY KEY,
-            room_code VARCHAR(6),
-            name TEXT,
-            is_mafia BOOLEAN,
-            eliminated BOOLEAN DEFAULT FALSE,
-            UNIQUE(room_code, name) ,
-            word TEXT,
-            score INT DEFAULT 0,
-            round INT DEFAULT 1
-        );
-        """)
+    # Votes table
+    await conn.execute("""
+    CREATE TABLE IF NOT EXISTS votes (
+        id SERIAL PRIMARY KEY,
+        room_code VARCHAR(6),
+        round INT,
+        voter_name TEXT,
+        voted_name TEXT
+    );
+    """)
 
-        # Votes table
-        await conn.execute("""
-        CREATE TABLE IF NOT EXISTS votes (
-            id SERIAL PRIMARY KEY,
-            room_code VARCHAR(6),
-            round INT,
-            voter_name TEXT,
-            voted_name TEXT
-        );
-        """)
+    # Round result table (for tracking scores and round outcomes)
+    await conn.execute("""
+    CREATE TABLE IF NOT EXISTS round_results (
+        id SERIAL PRIMARY KEY,
+        room_code VARCHAR(6),
+        round INT,
+        eliminated_player TEXT,
+        was_mafia BOOLEAN,
+        timestamp TIMESTAMPTZ DEFAULT NOW()
+    );
+    """)
 
-        # Round result table (for tracking scores and round outcomes)
-        await conn.execute("""
-        CREATE TABLE IF NOT EXISTS round_results (
-            id SERIAL PRIMARY KEY,
-            room_code VARCHAR(6),
-            round INT,
-            eliminated_player TEXT,
-            was_mafia BOOLEAN,
-            timestamp TIMESTAMPTZ DEFAULT NOW()
-        );
-        """)
+    # Indexes for the (room_code, round) filters used on every request; players
+    # lookups by room_code are already served by its UNIQUE(room_code, name)
+    await conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_votes_rc_round ON votes(room_code, round);
+    CREATE INDEX IF NOT EXISTS idx_round_results_rc_round ON round_results(room_code, round DESC);
+    """)
+
+    # vote's ON CONFLICT (room_code, voter_name, round) needs a unique index on
+    # exactly those columns; only add one if the database doesn't have it yet
+    await conn.execute("""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_index i
+            WHERE i.indrelid = 'votes'::regclass
+              AND i.indisunique
+              AND i.indpred IS NULL
+              AND i.indexprs IS NULL
+              AND i.indnkeyatts = 3
+              AND (SELECT array_agg(a.attname::text ORDER BY a.attname)
+                   FROM pg_attribute a
+                   WHERE a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey))
+                  = ARRAY['room_code', 'round', 'voter_name']
+        ) THEN
+            CREATE UNIQUE INDEX uq_votes_rc_voter_round ON votes(room_code, voter_name, round);
+        END IF;
+    END $$;
+    """)
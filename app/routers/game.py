@@ -1,84 +1,171 @@
-from fastapi import APIRouter, HTTPException, Body, WebSocket, WebSocketDisconnect
-from ..db import get_db_pool
-import random, string, httpx
-from collections import defaultdict
+from fastapi import APIRouter, HTTPException, Body, Depends, Request, WebSocket, WebSocketDisconnect
+from ..db import get_pool
+import random, string, json
 import asyncio
 
 router = APIRouter()
-active_connections = defaultdict(dict)
+active_connections: dict[str, set[WebSocket]] = {}
+BROADCAST_TIMEOUT = 2.0  # seconds allowed per socket send
+BROADCAST_BATCH_WINDOW = 0.005  # seconds to wait for more messages to coalesce
+BROADCAST_BATCH_MAX = 16
+
+# Per-room (queue, writer task) pairs. A writer lives while its room has open
+# sockets and is cancelled when the last one disconnects.
+room_writers = {}
+
+# Room settings plus a random set of spy ids, so only mafia_count ids
+# travel over the wire instead of every player in the room
+ROOM_WITH_SPIES_QUERY = """
+    SELECT r.host_name, r.mafia_count, r.current_round,
+           (SELECT COUNT(*) FROM players WHERE room_code = $1) AS player_count,
+           ARRAY(
+               SELECT id FROM players WHERE room_code = $1
+               ORDER BY random() LIMIT r.mafia_count
+           ) AS mafia_ids
+    FROM rooms r WHERE r.code = $1
+"""
+
+WORD_API_URL = "https://random-word-api.vercel.app/api"
+WORD_LIST_SIZE = 10000
+FALLBACK_WORDS = ["apple", "banana"]
 
 # Helper functions
-async def assign_words_and_roles(pool, room_code, players, mafia_ids, next_round_num):
-    """Helper function to consistently assign words and roles"""
+async def fetch_word_list(http, fallback=FALLBACK_WORDS):
+    """Download the word pool once; rounds sample from it locally"""
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get("https://random-word-api.vercel.app/api?words=2")
-            words = resp.json()
-            civilian_word, spy_word = words[0], words[1]
+        resp = await http.get(WORD_API_URL, params={"words": WORD_LIST_SIZE}, timeout=10.0)
+        words = resp.json()
+        if isinstance(words, list) and len(words) >= 2:
+            return words
     except Exception:
-        # Fallback words if API fails
-        civilian_word, spy_word = "apple", "banana"
+        pass
+    # Keep the previous list (or the fallback words) if the API fails
+    return fallback
+
+def get_word_list(request: Request):
+    """Word pool fetched at startup and refreshed in the background"""
+    return request.app.state.words
+
+async def assign_words_and_roles(pool, words, room_code, mafia_ids, next_round_num):
+    """Helper function to consistently assign words and roles"""
+    civilian_word, spy_word = random.sample(words, 2)
     
-    async with pool.acquire() as connection:
-        async with connection.transaction():
-            for player in players:
-                is_mafia = player["id"] in mafia_ids
-                word = spy_word if is_mafia else civilian_word
-                await connection.execute("""
-                    UPDATE players 
-                    SET is_mafia = $1, word = $2, round = $3, eliminated = FALSE 
-                    WHERE id = $4
-                """, is_mafia, word, next_round_num, player["id"])
+    # One set-based UPDATE over the whole room instead of a round-trip per player
+    await pool.execute("""
+        UPDATE players
+        SET is_mafia = id = ANY($2::int[]),
+            word = CASE WHEN id = ANY($2::int[]) THEN $3 ELSE $4 END,
+            round = $5, eliminated = FALSE
+        WHERE room_code = $1
+    """, room_code, mafia_ids, spy_word, civilian_word, next_round_num)
     
     return civilian_word, spy_word
 
-async def generate_unique_room_code(pool):
+def rows_affected(status: str) -> int:
+    """Row count from an asyncpg command tag such as 'UPDATE 1'"""
+    return int(status.rsplit(" ", 1)[-1])
+
+async def insert_room_with_unique_code(pool, mafia_count, host_name):
+    """Insert a room and its host player under a fresh random code, retrying only on collision"""
     for _ in range(10):
         code = ''.join(random.choices(string.ascii_uppercase, k=6))
-        exists = await pool.fetchval("SELECT 1 FROM rooms WHERE code = $1", code)
-        if not exists:
+        # One statement, so both inserts share an implicit transaction
+        inserted = await pool.fetchval("""
+            WITH r AS (
+                INSERT INTO rooms (code, mafia_count, host_name) VALUES ($1, $2, $3)
+                ON CONFLICT (code) DO NOTHING
+                RETURNING code
+            )
+            INSERT INTO players (room_code, name)
+            SELECT code, $3 FROM r
+            RETURNING room_code
+        """, code, mafia_count, host_name)
+        if inserted:
             return code
     raise HTTPException(status_code=500, detail="Failed to generate unique room code")
 
+async def send_messages(connection: WebSocket, messages: list):
+    # One plain text frame per event, in order
+    for message in messages:
+        await connection.send_text(message)
+
+async def send_to_room(room_code: str, messages: list):
+    # Send to every socket concurrently so one slow client can't stall the
+    # rest; failures and timeouts are swallowed per connection
+    connections = list(active_connections.get(room_code, ()))
+    await asyncio.gather(
+        *(asyncio.wait_for(send_messages(connection, messages), BROADCAST_TIMEOUT)
+          for connection in connections),
+        return_exceptions=True
+    )
+
+async def room_writer(room_code: str, queue: asyncio.Queue):
+    """Drain a room's queue, flushing bursts of messages together
+
+    Messages arriving within BROADCAST_BATCH_WINDOW are sent in one pass
+    over the room's sockets, but each is still its own plain text frame,
+    so clients always receive bare event strings such as "round_started".
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + BROADCAST_BATCH_WINDOW
+        while len(batch) < BROADCAST_BATCH_MAX:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        await send_to_room(room_code, batch)
+
+def stop_room_writer(room_code: str):
+    writer = room_writers.pop(room_code, None)
+    if writer is not None:
+        writer[1].cancel()
+
 async def broadcast(room_code: str, message: str):
-    for connection in active_connections.get(room_code, {}):
-        try:
-            await connection.send_text(message)
-        except:
-            continue
+    # Nobody listening (HTTP-only clients): don't spin up a queue or writer
+    if not active_connections.get(room_code):
+        return
+    writer = room_writers.get(room_code)
+    if writer is None:
+        queue = asyncio.Queue()
+        writer = room_writers[room_code] = (
+            queue, asyncio.create_task(room_writer(room_code, queue))
+        )
+    writer[0].put_nowait(message)
 
 # WebSocket endpoint
 @router.websocket("/ws/{room_code}")
 async def websocket_endpoint(websocket: WebSocket, room_code: str):
     await websocket.accept()
     try:
-        player_name = await websocket.receive_text()
-        active_connections[room_code][websocket] = player_name
-        while True:
-            await websocket.receive_text()
+        websocket.scope["player_name"] = await websocket.receive_text()
+        active_connections.setdefault(room_code, set()).add(websocket)
+        # Clients never send anything after their name; just wait for the
+        # disconnect on raw ASGI messages, which also tolerates binary frames
+        # that receive_text() (a bare message["text"] lookup) may choke on
+        message = await websocket.receive()
+        while message["type"] != "websocket.disconnect":
+            message = await websocket.receive()
     except (WebSocketDisconnect, RuntimeError):
         pass
     finally:
-        if websocket in active_connections.get(room_code, {}):
-            del active_connections[room_code][websocket]
+        connections = active_connections.get(room_code)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
+                del active_connections[room_code]
+                stop_room_writer(room_code)
 
 # Endpoints
 @router.post("/create-room")
-async def create_room(mafia_count: int = Body(...), name: str = Body(...)):
+async def create_room(mafia_count: int = Body(...), name: str = Body(...), pool=Depends(get_pool)):
     try:
-        pool = await get_db_pool()
-        code = await generate_unique_room_code(pool)
-        
-        async with pool.acquire() as connection:
-            async with connection.transaction():
-                await connection.execute(
-                    "INSERT INTO rooms (code, mafia_count, host_name) VALUES ($1, $2, $3)",
-                    code, mafia_count, name
-                )
-                await connection.execute(
-                    "INSERT INTO players (room_code, name) VALUES ($1, $2)",
-                    code, name
-                )
+        code = await insert_room_with_unique_code(pool, mafia_count, name)
         
         await broadcast(code, "game_started")
         return {"room_code": code, "is_host": True}
@@ -86,10 +173,9 @@ async def create_room(mafia_count: int = Body(...), name: str = Body(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/join-room")
-async def join_room(room_code: str = Body(...), name: str = Body(...)):
+async def join_room(room_code: str = Body(...), name: str = Body(...), pool=Depends(get_pool)):
     if len(name) < 1 or len(name) > 30:
         raise HTTPException(status_code=400, detail="Name too short or too long")
-    pool = await get_db_pool()
     room_code = room_code.upper()
     room = await pool.fetchrow("SELECT * FROM rooms WHERE code = $1", room_code)
     if not room:
@@ -101,154 +187,115 @@ async def join_room(room_code: str = Body(...), name: str = Body(...)):
     return {"message": f"{name} joined room {room_code}"}
 
 @router.post("/start-round")
-async def start_round(room_code: str = Body(...), name: str = Body(...)):
-    pool = await get_db_pool()
+async def start_round(room_code: str = Body(...), name: str = Body(...), pool=Depends(get_pool), words=Depends(get_word_list)):
     room_code = room_code.upper()
     
-    # Host verification
-    is_host = await pool.fetchval(
-        "SELECT host_name FROM rooms WHERE code = $1",
-        room_code
-    ) == name
-    if not is_host:
+    # Host verification, room settings and spies picked by Postgres in one round-trip
+    room = await pool.fetchrow(ROOM_WITH_SPIES_QUERY, room_code)
+    if not room or room["host_name"] != name:
         raise HTTPException(status_code=403, detail="Only host can start the round")
 
-    room = await pool.fetchrow("SELECT mafia_count FROM rooms WHERE code = $1", room_code)
-    if not room:
-        raise HTTPException(status_code=404, detail="Room not found")
-    
-    players = await pool.fetch(
-        "SELECT id FROM players WHERE room_code = $1", 
-        room_code
-    )
-    
-    if len(players) < room["mafia_count"]:
+    if room["player_count"] < room["mafia_count"]:
         raise HTTPException(status_code=400, detail="Not enough players")
 
-    mafia_ids = random.sample([p["id"] for p in players], room["mafia_count"])
+    # First round is 1; a room that already played continues numbering so
+    # its earlier round_results rows are never reused
+    round_num = (room["current_round"] or 0) + 1
     
     # Use helper function
     civilian_word, spy_word = await assign_words_and_roles(
-        pool, room_code, players, mafia_ids, 1  # First round is 1
+        pool, words, room_code, room["mafia_ids"], round_num
     )
 
     # Update game state
     await pool.execute("""
         UPDATE rooms 
-        SET status = 'ongoing', current_phase = 'discussion' 
+        SET status = 'ongoing', current_phase = 'discussion', current_round = $2
         WHERE code = $1
-    """, room_code)
+    """, room_code, round_num)
     
     await broadcast(room_code, "round_started")
     return {"message": "Round started"}
 
 @router.post("/start-voting")
-async def start_voting(room_code: str = Body(...), name: str = Body(...)):
-    pool = await get_db_pool()
+async def start_voting(room_code: str = Body(...), name: str = Body(...), pool=Depends(get_pool)):
     room_code = room_code.upper()
     
-    # Host verification
-    is_host = await pool.fetchval(
-        "SELECT host_name FROM rooms WHERE code = $1",
-        room_code
-    ) == name
-    if not is_host:
-        raise HTTPException(status_code=403, detail="Only host can start voting")
-
-    room = await pool.fetchrow(
-        "SELECT current_phase FROM rooms WHERE code = $1", 
-        room_code
-    )
-    if not room:
-        raise HTTPException(status_code=404, detail="Room not found")
-    if room['current_phase'] != 'discussion':
+    # Host and phase are enforced by the UPDATE itself
+    status = await pool.execute("""
+        UPDATE rooms SET current_phase = 'voting'
+        WHERE code = $1 AND host_name = $2 AND current_phase = 'discussion'
+    """, room_code, name)
+
+    if rows_affected(status) == 0:
+        # Only on failure: work out which check rejected the request
+        async with pool.acquire() as conn:
+            host_name = await conn.prepared["host_by_code"].fetchval(room_code)
+        if host_name != name:
+            raise HTTPException(status_code=403, detail="Only host can start voting")
         raise HTTPException(
             status_code=400, 
             detail="Can only start voting from discussion phase"
         )
 
-    await pool.execute(
-        "UPDATE rooms SET current_phase = 'voting' WHERE code = $1",
-        room_code
-    )
     await broadcast(room_code, "voting_started")
     return {"message": "Voting phase started"}
 
 @router.post("/end-game")
-async def end_game(room_code: str = Body(...), name: str = Body(...)):
-    pool = await get_db_pool()
+async def end_game(room_code: str = Body(...), name: str = Body(...), pool=Depends(get_pool)):
     room_code = room_code.upper()
     
-    # Host verification
-    is_host = await pool.fetchval(
-        "SELECT host_name FROM rooms WHERE code = $1",
-        room_code
-    ) == name
-    if not is_host:
+    # All four deletes in a single statement (and a single implicit
+    # transaction), each gated on the caller being the host
+    status = await pool.execute("""
+        WITH h AS (SELECT code FROM rooms WHERE code = $1 AND host_name = $2),
+             v AS (DELETE FROM votes WHERE room_code IN (SELECT code FROM h)),
+             r AS (DELETE FROM round_results WHERE room_code IN (SELECT code FROM h)),
+             p AS (DELETE FROM players WHERE room_code IN (SELECT code FROM h))
+        DELETE FROM rooms WHERE code IN (SELECT code FROM h)
+    """, room_code, name)
+    if rows_affected(status) == 0:
         raise HTTPException(status_code=403, detail="Only host can end the game")
 
-    await pool.execute("DELETE FROM votes WHERE room_code = $1", room_code)
-    await pool.execute("DELETE FROM round_results WHERE room_code = $1", room_code)
-    await pool.execute("DELETE FROM players WHERE room_code = $1", room_code)
-    await pool.execute("DELETE FROM rooms WHERE code = $1", room_code)
-
     await broadcast(room_code, "game_ended")
     return {"message": "Game ended and cleaned up"}
 
 @router.get("/is-host/{room_code}/{name}")
-async def check_host(room_code: str, name: str):
-    pool = await get_db_pool()
-    host_name = await pool.fetchval(
-        "SELECT host_name FROM rooms WHERE code = $1",
-        room_code.upper()
-    )
+async def check_host(room_code: str, name: str, pool=Depends(get_pool)):
+    async with pool.acquire() as conn:
+        stmt = conn.prepared["host_by_code"]
+        host_name = await stmt.fetchval(room_code.upper())
     return {"is_host": name == host_name}
 
 @router.get("/player-word/{room_code}/{name}")
-async def get_player_word(room_code: str, name: str):
-    pool = await get_db_pool()
-    player = await pool.fetchrow(
-        "SELECT word, is_mafia FROM players WHERE room_code = $1 AND name = $2", room_code, name)
+async def get_player_word(room_code: str, name: str, pool=Depends(get_pool)):
+    async with pool.acquire() as conn:
+        stmt = conn.prepared["player_word"]
+        player = await stmt.fetchrow(room_code, name)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     return {"word": player["word"],"is_mafia": player["is_mafia"]}
 
 @router.get("/players/{room_code}")
-async def get_players_public(room_code: str):
-    pool = await get_db_pool()
+async def get_players_public(room_code: str, pool=Depends(get_pool)):
     players = await pool.fetch("""
         SELECT name, score FROM players WHERE room_code = $1
     """, room_code)
     return {"players": [{"name": p["name"], "score": p["score"]} for p in players]}
 
 @router.post("/vote")
-async def vote(room_code: str = Body(...), voter_name: str = Body(...), voted_name: str = Body(...)):
-    pool = await get_db_pool()
+async def vote(room_code: str = Body(...), voter_name: str = Body(...), voted_name: str = Body(...), pool=Depends(get_pool)):
     room_code = room_code.upper()
     
-    current_round = await pool.fetchval(
-        "SELECT MAX(round) FROM round_results WHERE room_code = $1", 
-        room_code
-    ) or 1
-
     async with pool.acquire() as conn:
+        stmt = conn.prepared["current_round"]
+        current_round = await stmt.fetchval(room_code) or 1
+
         async with conn.transaction():
-            await conn.execute("""
-                INSERT INTO votes (room_code, round, voter_name, voted_name)
-                VALUES ($1, $2, $3, $4)
-                ON CONFLICT (room_code, voter_name, round) DO UPDATE
-                SET voted_name = EXCLUDED.voted_name
-            """, room_code, current_round, voter_name, voted_name)
-
-            active_players = await conn.fetchval("""
-                SELECT COUNT(*) FROM players WHERE room_code = $1
-            """, room_code)
-
-            current_votes = await conn.fetchval("""
-                SELECT COUNT(DISTINCT voter_name) 
-                FROM votes 
-                WHERE room_code = $1 AND round = $2
-            """, room_code, current_round)
+            stmt = conn.prepared["cast_vote"]
+            active_players, current_votes = await stmt.fetchrow(
+                room_code, current_round, voter_name, voted_name
+            )
 
             if current_votes >= active_players:
                 await process_round_results(conn, room_code, current_round)
@@ -257,23 +304,15 @@ async def vote(room_code: str = Body(...), voter_name: str = Body(...), voted_na
     return {"message": f"{voter_name} voted for {voted_name}"}
 
 async def process_round_results(conn, room_code, current_round):
-    vote_result = await conn.fetchrow("""
-        SELECT voted_name, COUNT(*) as votes
-        FROM votes
-        WHERE room_code = $1 AND round = $2
-        GROUP BY voted_name
-        ORDER BY votes DESC
-        LIMIT 1
-    """, room_code, current_round)
+    stmt = conn.prepared["top_vote"]
+    vote_result = await stmt.fetchrow(room_code, current_round)
 
     if not vote_result:
         raise HTTPException(status_code=400, detail="No votes cast")
 
     eliminated_name = vote_result["voted_name"]
-    eliminated = await conn.fetchrow(
-        "SELECT is_mafia FROM players WHERE room_code = $1 AND name = $2", 
-        room_code, eliminated_name
-    )
+    stmt = conn.prepared["player_is_mafia"]
+    eliminated = await stmt.fetchrow(room_code, eliminated_name)
 
     if eliminated["is_mafia"]:
         await conn.execute("""
@@ -312,41 +351,28 @@ async def process_round_results(conn, room_code, current_round):
     """, room_code)
 
 @router.get("/vote-count")
-async def get_vote_count(room_code: str):
-    pool = await get_db_pool()
-    current_round = await pool.fetchval(
-        "SELECT MAX(round) FROM round_results WHERE room_code = $1", 
-        room_code
-    ) or 1
-    
-    vote_count = await pool.fetchval("""
-        SELECT COUNT(DISTINCT voter_name) 
-        FROM votes 
-        WHERE room_code = $1 AND round = $2
-    """, room_code, current_round)
+async def get_vote_count(room_code: str, pool=Depends(get_pool)):
+    async with pool.acquire() as conn:
+        stmt = conn.prepared["current_round"]
+        current_round = await stmt.fetchval(room_code) or 1
+
+        stmt = conn.prepared["vote_count"]
+        vote_count = await stmt.fetchval(room_code, current_round)
     
     return {"count": vote_count}
 
 @router.post("/end-round")
-async def end_round(room_code: str = Body(..., embed=True)):
-    pool = await get_db_pool()
+async def end_round(room_code: str = Body(..., embed=True), pool=Depends(get_pool)):
     room_code = room_code.upper()
-    current_round = await pool.fetchval("SELECT MAX(round) FROM round_results WHERE room_code = $1", room_code) or 1
-
-    vote_results = await pool.fetch("""
-        SELECT voted_name, COUNT(*) as votes
-        FROM votes
-        WHERE room_code = $1 AND round = $2
-        GROUP BY voted_name
-        ORDER BY votes DESC
-        LIMIT 1
-    """, room_code, current_round)
-
-    if not vote_results:
-        raise HTTPException(status_code=400, detail="No votes cast")
+    async with pool.acquire() as conn:
+        current_round = await conn.prepared["current_round"].fetchval(room_code) or 1
+
+        vote_result = await conn.prepared["top_vote"].fetchrow(room_code, current_round)
+        if not vote_result:
+            raise HTTPException(status_code=400, detail="No votes cast")
 
-    eliminated_name = vote_results[0]["voted_name"]
-    eliminated = await pool.fetchrow("SELECT is_mafia FROM players WHERE room_code = $1 AND name = $2", room_code, eliminated_name)
+        eliminated_name = vote_result["voted_name"]
+        eliminated = await conn.prepared["player_is_mafia"].fetchrow(room_code, eliminated_name)
     if not eliminated:
         raise HTTPException(status_code=404, detail="Eliminated player not found")
 
@@ -382,83 +408,63 @@ async def end_round(room_code: str = Body(..., embed=True)):
     return {"message": f"{eliminated_name} was eliminated. Game ended!"}
 
 @router.get("/round-results/{room_code}")
-async def get_round_results(room_code: str):
-    pool = await get_db_pool()
+async def get_round_results(room_code: str, pool=Depends(get_pool)):
     room_code = room_code.upper()
-    current_round = await pool.fetchval(
-        "SELECT MAX(round) FROM round_results WHERE room_code = $1", room_code
-    ) or 1
-
-    votes = await pool.fetch(
-        "SELECT voter_name, voted_name FROM votes WHERE room_code = $1 AND round = $2",
-        room_code, current_round
-    )
-    elimination = await pool.fetchrow(
-        "SELECT eliminated_player, was_mafia FROM round_results WHERE room_code = $1 AND round = $2",
-        room_code, current_round
-    )
-    players = await pool.fetch(
-        "SELECT name, score, is_mafia FROM players WHERE room_code = $1",
-        room_code
-    )
+    # Round, votes, elimination and players in a single round-trip
+    result = await pool.fetchrow("""
+        WITH cr AS (
+            SELECT COALESCE(NULLIF(
+                (SELECT current_round FROM rooms WHERE code = $1), 0), 1) AS round
+        )
+        SELECT
+            (SELECT json_agg(json_build_object('voter', v.voter_name, 'voted', v.voted_name))
+             FROM votes v WHERE v.room_code = $1 AND v.round = cr.round) AS votes,
+            e.eliminated_player, e.was_mafia,
+            (SELECT json_agg(json_build_object('name', p.name, 'score', p.score, 'is_mafia', p.is_mafia))
+             FROM players p WHERE p.room_code = $1) AS players
+        FROM cr
+        LEFT JOIN LATERAL (
+            SELECT eliminated_player, was_mafia FROM round_results
+            WHERE room_code = $1 AND round = cr.round
+            ORDER BY id DESC
+            LIMIT 1
+        ) e ON TRUE
+    """, room_code)
     return {
-        "votes": [{"voter": v["voter_name"], "voted": v["voted_name"]} for v in votes],
-        "eliminated": elimination["eliminated_player"] if elimination else None,
-        "was_mafia": elimination["was_mafia"] if elimination else None,
-        "players": [{"name": p["name"], "score": p["score"], "is_mafia": p["is_mafia"]} for p in players]
+        "votes": json.loads(result["votes"]) if result["votes"] else [],
+        "eliminated": result["eliminated_player"],
+        "was_mafia": result["was_mafia"],
+        "players": json.loads(result["players"]) if result["players"] else []
     }
 
 @router.post("/next-round")
-async def next_round(room_code: str = Body(...), name: str = Body(...)):
-    pool = await get_db_pool()
+async def next_round(room_code: str = Body(...), name: str = Body(...), pool=Depends(get_pool), words=Depends(get_word_list)):
     room_code = room_code.upper()
 
-    # Host verification
-    is_host = await pool.fetchval(
-        "SELECT host_name FROM rooms WHERE code = $1",
-        room_code
-    ) == name
+    # Host verification, current round and spies for this round (picked
+    # from all players, including previously eliminated ones) in one round-trip
+    room = await pool.fetchrow(ROOM_WITH_SPIES_QUERY, room_code)
     
-    if not is_host:
+    if not room or room["host_name"] != name:
         raise HTTPException(status_code=403, detail="Only host can start next round")
 
-    # Get current round
-    current_round = await pool.fetchval(
-        "SELECT MAX(round) FROM round_results WHERE room_code = $1", 
-        room_code
-    ) or 0
-    next_round_num = current_round + 1
-
-    # Get all players (including previously eliminated ones)
-    players = await pool.fetch(
-        "SELECT id FROM players WHERE room_code = $1",
-        room_code
-    )
-    mafia_count = await pool.fetchval(
-        "SELECT mafia_count FROM rooms WHERE code = $1",
-        room_code
-    )
+    next_round_num = (room["current_round"] or 0) + 1
 
-    if len(players) < mafia_count:
+    if room["player_count"] < room["mafia_count"]:
         raise HTTPException(status_code=400, detail="Not enough players")
 
-    # Select spies for this round from all players
-    mafia_ids = random.sample([p["id"] for p in players], mafia_count)
-
     # Use helper function
     civilian_word, spy_word = await assign_words_and_roles(
-        pool, room_code, players, mafia_ids, next_round_num
+        pool, words, room_code, room["mafia_ids"], next_round_num
     )
 
-    # Update game state
+    # Update game state and clear previous votes in one statement
     await pool.execute("""
+        WITH cleared AS (DELETE FROM votes WHERE room_code = $1)
         UPDATE rooms 
-        SET status = 'ongoing', current_phase = 'discussion' 
+        SET status = 'ongoing', current_phase = 'discussion', current_round = $2
         WHERE code = $1
-    """, room_code)
-
-    # Clear previous votes
-    await pool.execute("DELETE FROM votes WHERE room_code = $1", room_code)
+    """, room_code, next_round_num)
 
     # Broadcast to all players
     await broadcast(room_code, "round_started")
@@ -470,8 +476,7 @@ async def next_round(room_code: str = Body(...), name: str = Body(...)):
     }
 
 @router.get("/leaderboard/{room_code}")
-async def leaderboard(room_code: str):
-    pool = await get_db_pool()
+async def leaderboard(room_code: str, pool=Depends(get_pool)):
     room_code = room_code.upper()
 
     players = await pool.fetch("""
@@ -480,8 +485,7 @@ async def leaderboard(room_code: str):
     return {"leaderboard": [{"name": p["name"], "score": p["score"]} for p in players]}
 
 @router.get("/room-status/{room_code}")
-async def get_room_status(room_code: str):
-    pool = await get_db_pool()
+async def get_room_status(room_code: str, pool=Depends(get_pool)):
     room_code = room_code.upper()
 
     status = await pool.fetchrow(